@@ -1,19 +1,57 @@
+from __future__ import annotations
+
 import os
 import tempfile
 import asyncio
+import functools
+import json
+import logging
 import uuid
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
-from pydantic import BaseModel, ConfigDict
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+import rag
+from rag.utills import DEFAULT_DEDUP_THRESHOLD
+
+from dotenv import load_dotenv
+load_dotenv()
+
+if TYPE_CHECKING:
+    from rag import RAGGraph
+
+logger = logging.getLogger(__name__)
+
+async def warm_up_rag(app: FastAPI) -> None:
+    """Load models in the background and mark the app as ready when done."""
+    try:
+        await asyncio.to_thread(rag.warm_up)
+        app.state.ready = True
+    except Exception as e:
+        app.state.warm_up_error = str(e)
+        logger.critical(f"Warm-up failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.warm_up_error = None
+    warm_up_task = asyncio.create_task(warm_up_rag(app))
+    yield
+    warm_up_task.cancel()
 
-from rag import prepare_rag_assets, RAGGraph
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 class User(BaseModel):
     message_history: list[str]
     model_config = ConfigDict(extra='forbid')
 
-rag_sessions: dict[str, tuple[RAGGraph, User]] = {}
+rag_sessions: dict[str, tuple[RAGGraph, User, str]] = {}
+# CHUNK_DEDUP_THRESHOLD=0 turns near-duplicate merging off.
+dedup_threshold = float(os.getenv("CHUNK_DEDUP_THRESHOLD", DEFAULT_DEDUP_THRESHOLD))
+document_registry = rag.DocumentRegistry(dedup_threshold=dedup_threshold or None)
 
 class UserMessage(BaseModel):
     """
@@ -26,6 +64,24 @@ class UserMessage(BaseModel):
     message: str
     model_config = ConfigDict(extra='forbid')
 
+# Must match the size of the shared LLM executor in rag.graph_logic.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+BATCH_MAX_QUESTIONS = int(os.getenv("BATCH_MAX_QUESTIONS", "256"))
+
+class BatchQuestions(BaseModel):
+    """
+    Schema for a batch of independent questions.
+
+    Attributes:
+        session_id (str): The user's session_id.
+        questions (list[str]): Questions to answer, at most `BATCH_MAX_QUESTIONS`.
+        max_concurrency (int): Maximum number of parallel LLM calls, at most
+            `LLM_MAX_CONCURRENCY`.
+    """
+    session_id: str
+    questions: list[str] = Field(min_length=1, max_length=BATCH_MAX_QUESTIONS)
+    max_concurrency: int = Field(min(8, LLM_MAX_CONCURRENCY), ge=1, le=LLM_MAX_CONCURRENCY)
+    model_config = ConfigDict(extra='forbid')
 
 
 
@@ -42,13 +98,54 @@ def get_answer_sync(rag_instance, msg):
     return rag_instance.get_query(msg)["text"]
 
 def initialize_rag_sync(path):
-    chunks, embedder, vector_db = prepare_rag_assets(path)
-    return RAGGraph(chunks, embedder, vector_db)
+    document_key, (chunks, embedder, vector_db) = document_registry.acquire(path)
+    try:
+        return document_key, rag.RAGGraph(chunks, embedder, vector_db)
+    except Exception:
+        document_registry.release(document_key)
+        raise
 
-@app.get("/health")
-async def health_check():
+def discard_initialized_rag(tmp_path: str,
+                            previous_document_key: str | None,
+                            init_task: asyncio.Future) -> None:
+    """Clean up after an upload whose request was cancelled mid-processing.
+
+    The session's previous document is released only here, after the
+    new acquire has finished, so re-uploading the same file cannot drop
+    its shared index in between.
+
+    Args:
+        tmp_path (str): Temporary copy of the uploaded file.
+        previous_document_key (str | None): Document the session used before.
+        init_task (asyncio.Future): Finished `initialize_rag_sync` task.
+    """
+    os.unlink(tmp_path)
+    if not init_task.cancelled() and init_task.exception() is None:
+        document_key, _ = init_task.result()
+        document_registry.release(document_key)
+    if previous_document_key is not None:
+        document_registry.release(previous_document_key)
+
+@app.get("/health/live")
+async def liveness_check():
+    """Report that the process is up, regardless of model state."""
     return {"status": "ok"}
 
+@app.get("/health/ready")
+@app.get("/health")
+async def readiness_check():
+    """
+    Report whether the models are loaded and the API can serve uploads.
+
+    Raises:
+        HTTPException: 503 while warm-up is running or if it failed.
+    """
+    if app.state.warm_up_error is not None:
+        raise HTTPException(status_code=503, detail=f"Warm-up failed: {app.state.warm_up_error}")
+    if not app.state.ready:
+        raise HTTPException(status_code=503, detail="Warming up")
+    return {"status": "ready"}
+
 @app.post("/upload")
 async def upload_file(
         session_id: str | None = Form(None),
@@ -58,7 +155,9 @@ async def upload_file(
     Upload a file and initialize the RAG pipeline.
 
     The uploaded file is temporarily saved to RAM, processed to create
-    embeddings and a vector database, and then removed.
+    embeddings and a vector database, and then removed. Identical files
+    share one index through the document registry, so repeat uploads
+    skip processing.
 
     Args:
         file (UploadFile): File uploaded by the user.
@@ -69,25 +168,36 @@ async def upload_file(
     Raises:
         HTTPException: If an error occurs during file processing.
     """
+    previous_document_key: str | None = None
     if session_id not in rag_sessions:
         session_id: str = generate_id()
     else:
-        del rag_sessions[session_id]
+        previous_document_key = rag_sessions.pop(session_id)[2]
     with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as tmp:
         content = await file.read()
         tmp.write(content)
         tmp.flush()
         tmp_path = tmp.name
 
+    init_task = asyncio.ensure_future(asyncio.to_thread(initialize_rag_sync, tmp_path))
     try:
-        new_rag_instance: RAGGraph = await asyncio.to_thread(initialize_rag_sync, tmp_path)
+        document_key, new_rag_instance = await asyncio.shield(init_task)
         new_user = User(message_history=[])
-        rag_sessions[session_id] = (new_rag_instance, new_user)
+        rag_sessions[session_id] = (new_rag_instance, new_user, document_key)
+    except asyncio.CancelledError:
+        # The worker thread keeps running; release whatever it acquires.
+        init_task.add_done_callback(
+            functools.partial(discard_initialized_rag, tmp_path, previous_document_key))
+        tmp_path = None
+        previous_document_key = None
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File upload error: {str(e)}")
     finally:
-        os.unlink(tmp_path)
-        pass
+        if tmp_path is not None:
+            os.unlink(tmp_path)
+        if previous_document_key is not None:
+            document_registry.release(previous_document_key)
 
     return {"status": "File processed and RAG initialized",
             "session_id": session_id}
@@ -116,4 +226,44 @@ async def send_message(user_data: UserMessage):
     message: str = "\n".join(current_user.message_history)
     result = await asyncio.to_thread(get_answer_sync, current_rag, message)
     current_user.message_history.append(result)
-    return {"response": result}
\ No newline at end of file
+    return {"response": result}
+
+@app.post("/chat/batch")
+async def send_batch(batch: BatchQuestions):
+    """
+    Answer many questions against one session without touching its history.
+
+    Results are streamed as NDJSON lines in completion order, each of the form
+    {"index": int, "question": str, "response": str} or
+    {"index": int, "question": str, "error": str}.
+
+    Args:
+        batch (BatchQuestions): Session id and the questions to answer.
+
+    Returns:
+        StreamingResponse: NDJSON stream of answers.
+
+    Raises:
+        HTTPException: If no file has been uploaded for the session, or if
+            embedding or searching the questions fails.
+    """
+    if batch.session_id not in rag_sessions:
+        raise HTTPException(status_code=400, detail="Firstly upload file /upload")
+    current_rag: RAGGraph = rag_sessions[batch.session_id][0]
+
+    try:
+        answers = await asyncio.to_thread(current_rag.get_batch_queries,
+                                          batch.questions, batch.max_concurrency)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch retrieval error: {str(e)}")
+
+    def stream_answers():
+        for idx, result in answers:
+            line = {"index": idx, "question": batch.questions[idx]}
+            if "error" in result:
+                line["error"] = result["error"]
+            else:
+                line["response"] = result["text"]
+            yield json.dumps(line) + "\n"
+
+    return StreamingResponse(stream_answers(), media_type="application/x-ndjson")
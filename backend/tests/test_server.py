@@ -0,0 +1,146 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import rag
+from backend import server
+from rag.registry import DocumentRegistry
+
+
+class FakeRAGGraph:
+    def __init__(self, chunks, embedder, vector_db):
+        self.chunks = chunks
+
+
+class FakeUploadFile:
+    filename = "handbook.txt"
+
+    async def read(self):
+        return b"Company handbook"
+
+
+@pytest.fixture
+def ingest_calls(monkeypatch):
+    calls = []
+
+    def fake_prepare_rag_assets(file_path, **kwargs):
+        calls.append(file_path)
+        return ["chunk"], "embedder", "vector_db"
+
+    monkeypatch.setattr("rag.engine.prepare_rag_assets", fake_prepare_rag_assets)
+    monkeypatch.setattr(rag, "RAGGraph", FakeRAGGraph)
+    monkeypatch.setattr(server, "document_registry", DocumentRegistry())
+    monkeypatch.setattr(server, "rag_sessions", {})
+    return calls
+
+
+def upload(client, session_id=None):
+    data = {"session_id": session_id} if session_id else {}
+    response = client.post("/upload", data=data,
+                           files={"file": ("handbook.txt", b"Company handbook", "text/plain")})
+    assert response.status_code == 200
+    return response.json()["session_id"]
+
+
+def test_reupload_of_same_document_reuses_index(ingest_calls):
+    client = TestClient(server.app)
+
+    session_id = upload(client)
+    assert upload(client, session_id) == session_id
+
+    assert len(ingest_calls) == 1
+    [entry] = server.document_registry._entries.values()
+    assert entry.refcount == 1
+
+
+def test_cancelled_reupload_releases_after_acquire(monkeypatch, ingest_calls):
+    session_id = upload(TestClient(server.app))
+    initialize_rag_sync = server.initialize_rag_sync
+
+    def slow_initialize_rag_sync(path):
+        time.sleep(0.2)
+        return initialize_rag_sync(path)
+
+    monkeypatch.setattr(server, "initialize_rag_sync", slow_initialize_rag_sync)
+
+    async def cancel_upload():
+        task = asyncio.create_task(server.upload_file(session_id, FakeUploadFile()))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.5)
+
+    asyncio.run(cancel_upload())
+
+    assert len(ingest_calls) == 1
+    assert server.document_registry._entries == {}
+    assert session_id not in server.rag_sessions
+
+
+class FakeBatchRAG:
+    def __init__(self, fail_retrieval=False):
+        self.fail_retrieval = fail_retrieval
+        self.max_concurrency = None
+
+    def get_batch_queries(self, questions, max_concurrency):
+        if self.fail_retrieval:
+            raise RuntimeError("embedding failed")
+        self.max_concurrency = max_concurrency
+        return iter([(1, {"error": "model unavailable"}), (0, {"text": "first answer"})])
+
+
+@pytest.fixture
+def batch_client(monkeypatch):
+    monkeypatch.setattr(server, "rag_sessions", {})
+    return TestClient(server.app)
+
+
+def test_batch_streams_ndjson_lines_with_errors(batch_client):
+    fake_rag = FakeBatchRAG()
+    server.rag_sessions["session"] = (fake_rag, server.User(message_history=[]), "key")
+
+    response = batch_client.post("/chat/batch", json={"session_id": "session",
+                                                      "questions": ["q0", "q1"],
+                                                      "max_concurrency": 4})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"index": 1, "question": "q1", "error": "model unavailable"},
+        {"index": 0, "question": "q0", "response": "first answer"},
+    ]
+    assert fake_rag.max_concurrency == 4
+    assert server.rag_sessions["session"][1].message_history == []
+
+
+def test_batch_retrieval_failure_returns_500(batch_client):
+    server.rag_sessions["session"] = (FakeBatchRAG(fail_retrieval=True),
+                                      server.User(message_history=[]), "key")
+
+    response = batch_client.post("/chat/batch", json={"session_id": "session", "questions": ["q0"]})
+
+    assert response.status_code == 500
+    assert "embedding failed" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("payload", [
+    {"questions": ["q"] * (server.BATCH_MAX_QUESTIONS + 1)},
+    {"questions": ["q"], "max_concurrency": server.LLM_MAX_CONCURRENCY + 1},
+    {"questions": []},
+])
+def test_batch_limits_are_validated(batch_client, payload):
+    server.rag_sessions["session"] = (FakeBatchRAG(), server.User(message_history=[]), "key")
+
+    response = batch_client.post("/chat/batch", json={"session_id": "session", **payload})
+
+    assert response.status_code == 422
+
+
+def test_batch_requires_uploaded_session(batch_client):
+    response = batch_client.post("/chat/batch", json={"session_id": "missing", "questions": ["q"]})
+
+    assert response.status_code == 400
@@ -1,2 +1,25 @@
-from .graph_logic import RAGGraph
-from .engine import prepare_rag_assets
\ No newline at end of file
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .graph_logic import RAGGraph
+    from .engine import prepare_rag_assets, warm_up
+    from .registry import DocumentRegistry
+
+# Heavy submodules are imported on first attribute access so that
+# `import rag` stays cheap and start-up cost is paid in `warm_up`.
+_LAZY_ATTRS = {
+    "RAGGraph": ".graph_logic",
+    "prepare_rag_assets": ".engine",
+    "warm_up": ".engine",
+    "DocumentRegistry": ".registry",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,42 @@
+"""Import-time and start-up benchmark.
+
+Usage:
+    uv run python -m rag.benchmark
+"""
+import subprocess
+import sys
+from time import perf_counter
+
+IMPORT_TARGETS = ("rag", "rag.engine", "rag.graph_logic")
+
+def measure_import(module: str) -> float:
+    """Measure the cold import time of a module in a fresh interpreter.
+
+    Args:
+        module (str): Dotted module name.
+
+    Returns:
+        float: Import time in seconds.
+    """
+    code = (
+        "from time import perf_counter; start = perf_counter(); "
+        f"import {module}; print(perf_counter() - start)"
+    )
+    result = subprocess.run([sys.executable, "-c", code],
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    for module in IMPORT_TARGETS:
+        print(f"import {module}: {measure_import(module):.3f}s")
+
+    from rag import warm_up
+
+    start = perf_counter()
+    timings = warm_up()
+    for stage, seconds in timings.items():
+        print(f"warm_up.{stage}: {seconds:.3f}s")
+    print(f"warm_up total: {perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":
+    main()
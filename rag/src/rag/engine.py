@@ -1,15 +1,38 @@
-from numpy import ndarray
+from __future__ import annotations
 
-from .utills import (read_data, split_text, Embedder, create_vectorDB)
+import logging
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from .utills import (read_data, split_text, deduplicate_chunks, DEFAULT_DEDUP_THRESHOLD,
+                     get_embedder, DEFAULT_MODEL_NAME, create_vectorDB, preload_readers)
 from langchain_core.documents import Document
-from faiss import Index
 
-def prepare_rag_assets(file_path: str):
+if TYPE_CHECKING:
+    from numpy import ndarray
+    from faiss import Index
+
+logger = logging.getLogger(__name__)
+
+def prepare_rag_assets(file_path: str,
+                       chunk_size: int = 512,
+                       chunk_overlap: int = 100,
+                       dedup_threshold: float | None = DEFAULT_DEDUP_THRESHOLD,
+                       model_name: str = DEFAULT_MODEL_NAME):
     """Prepare data for RAG
 
     Args:
         file_path (str): Path to the file
 
+        chunk_size (int): Max size of each chunk.
+
+        chunk_overlap (int): Overlap between chunks.
+
+        dedup_threshold (float | None): Similarity at which near-duplicate
+            chunks are merged before embedding. None disables deduplication.
+
+        model_name (str): Embedding model name.
+
     Returns:
         splitted_text (str): splitted text for chunks.
 
@@ -18,9 +41,53 @@ def prepare_rag_assets(file_path: str):
         vector_db (faiss.Index): vector database.
     """
     extracted_text: str = read_data(file_path)
-    splitted_text: list[Document] = split_text(extracted_text)
-    embedder = Embedder()
+    splitted_text: list[Document] = split_text(extracted_text, chunk_size, chunk_overlap)
+    total_chunks = len(splitted_text)
+    if dedup_threshold is not None:
+        splitted_text = deduplicate_chunks(splitted_text, threshold=dedup_threshold)
+        logger.info(f"Deduplicated chunks: {total_chunks} -> {len(splitted_text)}")
+    embedder = get_embedder(model_name)
+    start = perf_counter()
     embeddings: ndarray = embedder.make_embeddings(splitted_text)
+    embedding_time = perf_counter() - start
+    saved_time = embedding_time / max(len(splitted_text), 1) * (total_chunks - len(splitted_text))
+    logger.info(f"Embedded {len(splitted_text)} chunks in {embedding_time:.2f}s "
+                f"(~{saved_time:.2f}s saved by deduplication)")
     vector_db: Index = create_vectorDB(embeddings)
 
-    return splitted_text, embedder, vector_db
\ No newline at end of file
+    return splitted_text, embedder, vector_db
+
+def warm_up() -> dict[str, float]:
+    """Load heavy dependencies and run a dummy pass through the pipeline.
+
+    Loads the embedding model, encodes a dummy document, builds a FAISS
+    index from it and searches it, so the first real upload does not pay
+    the model load cost.
+
+    Returns:
+        dict[str, float]: Seconds spent on each warm-up stage.
+    """
+    from .graph_logic import get_model
+
+    timings: dict[str, float] = {}
+
+    start = perf_counter()
+    embedder = get_embedder()
+    timings["load_embedder"] = perf_counter() - start
+
+    start = perf_counter()
+    embeddings: ndarray = embedder.make_embeddings([Document(page_content="warm-up")])
+    timings["encode"] = perf_counter() - start
+
+    start = perf_counter()
+    vector_db: Index = create_vectorDB(embeddings)
+    vector_db.search(x=embeddings.astype("float32"), k=1)
+    timings["faiss_search"] = perf_counter() - start
+
+    start = perf_counter()
+    preload_readers()
+    get_model()
+    timings["load_readers_and_llm"] = perf_counter() - start
+
+    logger.info(f"Warm-up completed: {timings}")
+    return timings
@@ -1,26 +1,51 @@
+from __future__ import annotations
+
+import logging
 import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
 
 from langchain_core.messages import AnyMessage, AIMessage, HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, END, add_messages
 from langgraph.prebuilt import ToolNode
 
 from langchain_core.documents import Document
-from numpy import ndarray
-from faiss import Index
-
 from typing import TypedDict, Annotated
-from langchain_deepseek import ChatDeepSeek
 
-from .utills import TOOLS
+from .utills import TOOLS, mmr_search
 
 from dotenv import load_dotenv
 load_dotenv()
 
+if TYPE_CHECKING:
+    from numpy import ndarray
+    from faiss import Index
+
+logger = logging.getLogger(__name__)
+
+# Shared by all batch requests so the total number of parallel LLM calls
+# stays bounded no matter how many batches run at once.
+_llm_executor = ThreadPoolExecutor(max_workers=int(os.getenv("LLM_MAX_CONCURRENCY", "16")),
+                                   thread_name_prefix="llm")
+
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """Return the shared DeepSeek chat model with tools bound, creating it on first call."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from langchain_deepseek import ChatDeepSeek
 
-model = ChatDeepSeek(
-    model="deepseek-chat",
-    api_key=os.getenv("DEEPSEEK_API_KEY"),
-).bind_tools(TOOLS)
+                _model = ChatDeepSeek(
+                    model="deepseek-chat",
+                    api_key=os.getenv("DEEPSEEK_API_KEY"),
+                ).bind_tools(TOOLS)
+    return _model
 
 class State(TypedDict):
     extracted_docs: list[Document]
@@ -41,7 +66,7 @@ class RAGGraph:
                  embedder,
                  vector_db: Index):
 
-        self.model = model
+        self.model = get_model()
         self.splitted_text = splitted_text
         self.embedder = embedder
         self.vector_db = vector_db
@@ -71,10 +96,33 @@ class RAGGraph:
 
         message_doc = [Document(page_content=last_message.content)]
         message_embeddings: ndarray = self.embedder.make_embeddings(message_doc)
-        _, indices = self.vector_db.search(x=message_embeddings, k=int(os.getenv("VDB_SEARCH_K")))
-        found_docs: list[Document] = [self.splitted_text[vec] for vec in indices[0]]
+        found_docs: list[Document] = self._search(message_embeddings)[0]
         return {"extracted_docs": found_docs}
 
+    def _search(self, query_embeddings: ndarray) -> list[list[Document]]:
+        """
+        Find the top-k documents for each query embedding.
+
+        All queries are answered by a single FAISS search over the
+        (N, d) matrix. When `VDB_MMR_LAMBDA` is set, that search fetches
+        extra candidates which are re-ranked with MMR per query to favour
+        diverse chunks.
+
+        Args:
+            query_embeddings (ndarray): 2D array with shape (N, d).
+
+        Returns:
+            list[list[Document]]: Retrieved documents for each query.
+        """
+        k = int(os.getenv("VDB_SEARCH_K"))
+        mmr_lambda = os.getenv("VDB_MMR_LAMBDA")
+        if mmr_lambda:
+            found_ids = mmr_search(self.vector_db, query_embeddings, k=k, lambda_mult=float(mmr_lambda))
+        else:
+            _, indices = self.vector_db.search(x=query_embeddings, k=k)
+            found_ids = [[vec for vec in row if vec != -1] for row in indices]
+        return [[self.splitted_text[vec] for vec in ids] for ids in found_ids]
+
     def _generate_node(self, state: State) -> State:
         """
         Generation LangGraph node.
@@ -105,16 +153,18 @@ class RAGGraph:
             return "tools"
         return "end"
 
-    def _build_graph(self):
+    def _build_graph(self, with_retriever: bool = True):
         graph = StateGraph(State)
 
-        graph.add_node("retriever", self._retriever_node)
         graph.add_node("generate", self._generate_node)
         graph.add_node("tools", self._tool_node)
 
-        graph.set_entry_point("retriever")
-
-        graph.add_edge("retriever", "generate")
+        if with_retriever:
+            graph.add_node("retriever", self._retriever_node)
+            graph.set_entry_point("retriever")
+            graph.add_edge("retriever", "generate")
+        else:
+            graph.set_entry_point("generate")
 
         graph.add_conditional_edges(
             "generate",
@@ -147,3 +197,106 @@ class RAGGraph:
         return {
             "text": last_msg.content,
         }
+
+    def get_batch_queries(self,
+                          user_questions: list[str],
+                          max_concurrency: int = 8) -> Iterator[tuple[int, dict]]:
+        """
+        Answer many independent questions against the same document.
+
+        Retrieval runs eagerly, so embedding and search errors are raised
+        by this call; only the LLM generations are deferred to the
+        returned iterator.
+
+        Args:
+            user_questions (list[str]): User's queries.
+            max_concurrency (int): Maximum number of parallel LLM calls
+                for this batch.
+
+        Returns:
+            Iterator[tuple[int, dict]]: See `generate_batch`.
+        """
+        found_docs = self.retrieve_batch(user_questions)
+        return self.generate_batch(user_questions, found_docs, max_concurrency)
+
+    def retrieve_batch(self, user_questions: list[str]) -> list[list[Document]]:
+        """
+        Retrieve context for many questions at once.
+
+        All questions are embedded in one `make_embeddings` call and
+        searched with a single batched FAISS query.
+
+        Args:
+            user_questions (list[str]): User's queries.
+
+        Returns:
+            list[list[Document]]: Retrieved documents for each question.
+        """
+        if not user_questions:
+            return []
+        question_docs = [Document(page_content=question) for question in user_questions]
+        question_embeddings: ndarray = self.embedder.make_embeddings(question_docs)
+        return self._search(question_embeddings)
+
+    def generate_batch(self,
+                       user_questions: list[str],
+                       found_docs: list[list[Document]],
+                       max_concurrency: int = 8) -> Iterator[tuple[int, dict]]:
+        """
+        Generate answers for questions with already retrieved context.
+
+        At most `max_concurrency` generations of this batch are in flight
+        at a time, on the executor shared by all batches and capped by
+        `LLM_MAX_CONCURRENCY`. Answers are yielded as soon as each one
+        finishes, so results come out of order.
+
+        Args:
+            user_questions (list[str]): User's queries.
+            found_docs (list[list[Document]]): Context from `retrieve_batch`.
+            max_concurrency (int): Maximum number of parallel LLM calls
+                for this batch.
+
+        Returns:
+            Iterator[tuple[int, dict]]: Index of the question and either
+                {"text": str} with the LLM answer or {"error": str}.
+        """
+        app = self._build_graph(with_retriever=False)
+        return self._iter_answers(app, user_questions, found_docs, max_concurrency)
+
+    def _iter_answers(self,
+                      app,
+                      user_questions: list[str],
+                      found_docs: list[list[Document]],
+                      max_concurrency: int) -> Iterator[tuple[int, dict]]:
+        queued = iter(enumerate(zip(user_questions, found_docs)))
+        running: dict[Future, int] = {}
+
+        def submit_next() -> None:
+            item = next(queued, None)
+            if item is None:
+                return
+            idx, (question, docs) = item
+            future = _llm_executor.submit(app.invoke, {
+                "messages": [HumanMessage(content=question)],
+                "extracted_docs": docs,
+            })
+            running[future] = idx
+
+        for _ in range(max_concurrency):
+            submit_next()
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = running.pop(future)
+                    submit_next()
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Batch question {idx} failed: {e}")
+                        yield idx, {"error": str(e)}
+                        continue
+                    yield idx, {"text": result["messages"][-1].content}
+        finally:
+            for future in running:
+                future.cancel()
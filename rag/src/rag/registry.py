@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .utills import DEFAULT_MODEL_NAME, DEFAULT_DEDUP_THRESHOLD
+
+if TYPE_CHECKING:
+    from faiss import Index
+    from langchain_core.documents import Document
+    from .utills import Embedder
+
+    RAGAssets = tuple[tuple[Document, ...], Embedder, Index]
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class _Entry:
+    future: Future = field(default_factory=Future)
+    refcount: int = 0
+
+class DocumentRegistry:
+    """Share ingested documents between sessions.
+
+    Documents are keyed by a hash of the file bytes and the ingest
+    settings. Each key maps to a single read-only chunk tuple and FAISS
+    index, reference-counted across the sessions using it. Concurrent
+    uploads of the same document wait for the one ingest in progress.
+
+    Args:
+        chunk_size (int): Max size of each chunk.
+        chunk_overlap (int): Overlap between chunks.
+        dedup_threshold (float | None): Near-duplicate merge threshold.
+        model_name (str): Embedding model used for ingest, part of the document key.
+    """
+    def __init__(self,
+                 chunk_size: int = 512,
+                 chunk_overlap: int = 100,
+                 dedup_threshold: float | None = DEFAULT_DEDUP_THRESHOLD,
+                 model_name: str = DEFAULT_MODEL_NAME):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.dedup_threshold = dedup_threshold
+        self.model_name = model_name
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def document_key(self, file_path: str) -> str:
+        """Hash the file contents together with the ingest settings.
+
+        Args:
+            file_path (str): Path to the file.
+
+        Returns:
+            str: Hex digest identifying the document.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        settings = f"{self.chunk_size}:{self.chunk_overlap}:{self.dedup_threshold}:{self.model_name}"
+        digest.update(settings.encode("utf-8"))
+        return digest.hexdigest()
+
+    def acquire(self, file_path: str) -> tuple[str, RAGAssets]:
+        """Return the shared assets for a file, ingesting it if needed.
+
+        Every call must be paired with `release` once the caller no
+        longer uses the assets.
+
+        Args:
+            file_path (str): Path to the file.
+
+        Returns:
+            tuple[str, RAGAssets]: Document key and the shared
+                (chunks, embedder, vector_db) assets.
+
+        Raises:
+            Exception: If ingesting the document fails.
+        """
+        key = self.document_key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            is_owner = entry is None
+            if is_owner:
+                entry = _Entry()
+                self._entries[key] = entry
+            entry.refcount += 1
+
+        if is_owner:
+            from .engine import prepare_rag_assets
+
+            try:
+                chunks, embedder, vector_db = prepare_rag_assets(
+                    file_path,
+                    chunk_size=self.chunk_size,
+                    chunk_overlap=self.chunk_overlap,
+                    dedup_threshold=self.dedup_threshold,
+                    model_name=self.model_name,
+                )
+            except Exception as e:
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+                entry.future.set_exception(e)
+                raise
+            entry.future.set_result((tuple(chunks), embedder, vector_db))
+            logger.info(f"Document {key[:12]} ingested")
+        else:
+            logger.info(f"Document {key[:12]} reused from registry")
+
+        return key, entry.future.result()
+
+    def release(self, key: str) -> None:
+        """Drop one reference to a document, freeing it when none remain.
+
+        Args:
+            key (str): Document key returned by `acquire`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount -= 1
+            if entry.refcount <= 0:
+                del self._entries[key]
+                logger.info(f"Document {key[:12]} released")
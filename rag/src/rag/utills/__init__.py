@@ -1,6 +1,7 @@
-from .data_reader import read_data
-from .create_embeddings import Embedder
-from .vectorstore import create_vectorDB
+from .data_reader import read_data, preload_readers
+from .create_embeddings import Embedder, get_embedder, DEFAULT_MODEL_NAME
+from .vectorstore import create_vectorDB, mmr_search
+from .deduplicate import deduplicate_chunks, DEFAULT_DEDUP_THRESHOLD
 from .split_text import split_text
 from .tools import TOOLS
 
@@ -1,17 +1,29 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
 import numpy as np
-from FlagEmbedding import BGEM3FlagModel
-from langchain_core.documents import Document
 import logging
 
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL_NAME = 'BAAI/bge-m3'
+
+_embedders: dict[str, Embedder] = {}
+_embedder_lock = threading.Lock()
+
 class Embedder:
     """
     Args:
         model_name (str): HuggingFace model name.
     """
-    def __init__(self, model_name: str = 'BAAI/bge-m3'):
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME):
         try:
+            from FlagEmbedding import BGEM3FlagModel
             self.model = BGEM3FlagModel(model_name)
             logger.info(f"BGEM3 flag model loaded: {model_name}")
         except Exception as e:
@@ -46,3 +58,19 @@ class Embedder:
             logger.critical("Failed to encode documents")
             raise e
 
+
+
+def get_embedder(model_name: str = DEFAULT_MODEL_NAME) -> Embedder:
+    """Return the process-wide embedder for a model, loading it on first call.
+
+    Args:
+        model_name (str): HuggingFace model name.
+
+    Returns:
+        Embedder: shared embedder instance.
+    """
+    if model_name not in _embedders:
+        with _embedder_lock:
+            if model_name not in _embedders:
+                _embedders[model_name] = Embedder(model_name)
+    return _embedders[model_name]
@@ -1,7 +1,5 @@
-import pandas as pd
+from importlib import import_module
 from magic import from_buffer
-from mammoth import convert_to_markdown
-from pymupdf4llm import to_markdown
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,6 +32,12 @@ def read_data(file_path: str) -> str:
         logger.error(f"File format {file_format} not supported.")
         raise ValueError("Unsupported file type")
 
+def preload_readers() -> None:
+    """Import the heavy document parsing libraries ahead of the first upload."""
+    for module in ("pymupdf4llm", "mammoth", "pandas"):
+        import_module(module)
+    logger.info("Document readers loaded")
+
 def _read_PDF(file_path: str) -> str:
     """ Read PDF files.
 
@@ -44,6 +48,8 @@ def _read_PDF(file_path: str) -> str:
     Returns:
         str: Extracted text from the file.
     """
+    from pymupdf4llm import to_markdown
+
     return to_markdown(file_path, write_images=False)
 
 def _read_DOCX(file_path: str) -> str:
@@ -56,6 +62,7 @@ def _read_DOCX(file_path: str) -> str:
     Returns:
         str: Extracted text from the file.
     """
+    from mammoth import convert_to_markdown
 
     with open(file_path, "rb") as file:
         return convert_to_markdown(file).value
@@ -83,6 +90,8 @@ def _read_XLSX(file_path: str) -> str:
     Returns:
         str: Extracted text from the file.
     """
+    import pandas as pd
+
     df = pd.read_excel(file_path)
     return df.to_markdown(index=False)
 
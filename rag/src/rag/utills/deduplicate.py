@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from collections import defaultdict
+from typing import TYPE_CHECKING
+from zlib import crc32
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_NUMBER_PATTERN = re.compile(r"\d+")
+
+DEFAULT_DEDUP_THRESHOLD = 0.9
+
+def deduplicate_chunks(chunks: list[Document],
+                       threshold: float = DEFAULT_DEDUP_THRESHOLD,
+                       num_perm: int = 128,
+                       bands: int = 32,
+                       shingle_size: int = 5,
+                       seed: int = 0) -> list[Document]:
+    """Merge near-duplicate chunks using MinHash signatures and LSH.
+
+    Every chunk is reduced to a MinHash signature over its character
+    shingles. Chunks with identical signatures are grouped up front.
+    Within each LSH bucket, a chunk is compared by estimated Jaccard
+    similarity against the first chunk of each group seen so far and
+    merged into the best match when it reaches `threshold`. Chunks are
+    only merged when they contain exactly the same numbers, so chunks
+    that differ in a figure are always kept apart.
+
+    The first chunk of each group is kept. When it absorbed others, a
+    copy of it is returned whose metadata gets a `duplicates` list with
+    the metadata and content hash of every merged chunk. The input
+    documents are not modified.
+
+    Args:
+        chunks (list[Document]): Chunks produced by `split_text`.
+        threshold (float): Minimum estimated Jaccard similarity to merge.
+        num_perm (int): Number of hash permutations per signature.
+        bands (int): Number of LSH bands, must divide `num_perm`.
+        shingle_size (int): Length of character shingles.
+        seed (int): Seed for the hash permutations.
+
+    Returns:
+        list[Document]: Deduplicated chunks in their original order.
+
+    Raises:
+        ValueError: If `bands` does not divide `num_perm`.
+    """
+    if num_perm % bands:
+        raise ValueError("bands must divide num_perm")
+    if len(chunks) < 2:
+        return chunks
+
+    signatures = _minhash_signatures(chunks, num_perm, shingle_size, seed)
+    numbers = [tuple(_NUMBER_PATTERN.findall(chunk.page_content)) for chunk in chunks]
+    parent = list(range(len(chunks)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Exact signature matches (e.g. repeated headers) collapse into one
+    # representative, so LSH only compares distinct signatures.
+    representatives: dict[tuple[bytes, tuple[str, ...]], int] = {}
+    for idx in range(len(chunks)):
+        rep = representatives.setdefault((signatures[idx].tobytes(), numbers[idx]), idx)
+        parent[idx] = rep
+    rep_ids = np.fromiter(representatives.values(), dtype=np.int64)
+
+    rows = num_perm // bands
+    for band in range(bands):
+        # Chunks with different numbers never share a bucket.
+        buckets: dict[tuple[bytes, tuple[str, ...]], list[int]] = defaultdict(list)
+        band_slice = signatures[rep_ids, band * rows:(band + 1) * rows]
+        for idx, key in zip(rep_ids, band_slice):
+            buckets[key.tobytes(), numbers[idx]].append(int(idx))
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # Each member is compared with the first chunk of every group
+            # already seen in this bucket, not with every other member.
+            leaders: list[int] = []
+            leader_signatures = np.empty((len(members), num_perm), dtype=np.uint64)
+            leader_roots: set[int] = set()
+            for member in members:
+                if find(member) in leader_roots:
+                    continue
+                if leaders:
+                    matches = (leader_signatures[:len(leaders)] == signatures[member]).sum(axis=1)
+                    best = int(matches.argmax())
+                    if matches[best] >= threshold * num_perm:
+                        root_a, root_b = find(leaders[best]), find(member)
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+                        leader_roots.add(min(root_a, root_b))
+                        continue
+                leader_signatures[len(leaders)] = signatures[member]
+                leaders.append(member)
+                leader_roots.add(find(member))
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for idx in range(len(chunks)):
+        groups[find(idx)].append(idx)
+
+    deduplicated = []
+    for root in sorted(groups):
+        doc = chunks[root]
+        duplicates = [chunks[idx] for idx in groups[root][1:]]
+        if duplicates:
+            doc = doc.model_copy(update={"metadata": {
+                **doc.metadata,
+                "duplicates": [
+                    {
+                        "metadata": dict(duplicate.metadata),
+                        "content_hash": hashlib.sha256(duplicate.page_content.encode("utf-8")).hexdigest(),
+                    }
+                    for duplicate in duplicates
+                ],
+            }})
+        deduplicated.append(doc)
+    return deduplicated
+
+def _minhash_signatures(chunks: list[Document],
+                        num_perm: int,
+                        shingle_size: int,
+                        seed: int) -> np.ndarray:
+    """Compute MinHash signatures for a list of chunks.
+
+    Args:
+        chunks (list[Document]): Chunks to hash.
+        num_perm (int): Number of hash permutations.
+        shingle_size (int): Length of character shingles.
+        seed (int): Seed for the hash permutations.
+
+    Returns:
+        np.ndarray: 2D uint64 array with shape (len(chunks), num_perm).
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    signatures = np.empty((len(chunks), num_perm), dtype=np.uint64)
+    for idx, chunk in enumerate(chunks):
+        shingles = _shingle_hashes(chunk.page_content, shingle_size)
+        signatures[idx] = ((a * shingles + b) % _MERSENNE_PRIME).min(axis=1)
+    return signatures
+
+def _shingle_hashes(text: str, shingle_size: int) -> np.ndarray:
+    """Hash the unique character shingles of whitespace-normalized text.
+
+    Args:
+        text (str): Chunk text.
+        shingle_size (int): Length of character shingles.
+
+    Returns:
+        np.ndarray: 1D uint64 array of shingle hashes reduced modulo the prime.
+    """
+    normalized = " ".join(text.lower().split())
+    if len(normalized) <= shingle_size:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i:i + shingle_size]
+                    for i in range(len(normalized) - shingle_size + 1)}
+    hashes = np.fromiter((crc32(s.encode("utf-8")) for s in shingles),
+                         dtype=np.uint64, count=len(shingles))
+    return hashes % _MERSENNE_PRIME
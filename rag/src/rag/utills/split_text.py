@@ -1,5 +1,9 @@
-from langchain_text_splitters import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
-from langchain_core.documents import Document
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
 
 def split_text(text: str,
                chunk_size: int = 512,
@@ -14,6 +18,8 @@ def split_text(text: str,
     Returns:
         list[Document]: List of LangChain Documents with metadata.
     """
+    from langchain_text_splitters import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
+
     headers_on_split = [
         ("#", "Header 1"),
         ("##", "Header 2"),
@@ -1,8 +1,15 @@
-import faiss
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
 import logging
 
+if TYPE_CHECKING:
+    import faiss
+
 logger = logging.getLogger(__name__)
+
 def create_vectorDB(embeddings: np.ndarray) -> faiss.Index:
     """Create faiss index from embeddings.
 
@@ -15,6 +22,8 @@ def create_vectorDB(embeddings: np.ndarray) -> faiss.Index:
     Raises:
         Exception: If failed to create faiss index.
     """
+    import faiss
+
     try:
         dimension = embeddings.shape[1]
         vectorstore = faiss.IndexFlatIP(dimension)
@@ -25,3 +34,62 @@ def create_vectorDB(embeddings: np.ndarray) -> faiss.Index:
         logger.critical("Failed to create vectorDB")
         raise e
 
+
+def mmr_search(vector_db: faiss.Index,
+               queries: np.ndarray,
+               k: int,
+               fetch_k: int | None = None,
+               lambda_mult: float = 0.5) -> list[list[int]]:
+    """Search the index and re-rank candidates with Maximal Marginal Relevance.
+
+    All queries share a single FAISS search for `fetch_k` candidates;
+    MMR is then applied to each row.
+
+    Args:
+        vector_db (faiss.Index): Index built by `create_vectorDB`.
+        queries (np.ndarray): 2D numpy array with shape (N, d).
+        k (int): Number of results to return per query.
+        fetch_k (int, optional): Number of candidates to re-rank. Defaults to 4 * k.
+        lambda_mult (float): Trade-off between relevance (1.0) and diversity (0.0).
+
+    Returns:
+        list[list[int]]: Indices of the selected vectors for each query,
+            most relevant first.
+    """
+    fetch_k = min(fetch_k or 4 * k, vector_db.ntotal)
+    scores, indices = vector_db.search(x=queries.astype(np.float32), k=fetch_k)
+    return [_mmr_select(vector_db, row_scores, row_indices, k, lambda_mult)
+            for row_scores, row_indices in zip(scores, indices)]
+
+def _mmr_select(vector_db: faiss.Index,
+                scores: np.ndarray,
+                indices: np.ndarray,
+                k: int,
+                lambda_mult: float) -> list[int]:
+    """Pick `k` of one query's candidates with Maximal Marginal Relevance.
+
+    Args:
+        vector_db (faiss.Index): Index the candidates come from.
+        scores (np.ndarray): 1D array of candidate relevance scores.
+        indices (np.ndarray): 1D array of candidate ids, -1 for missing.
+        k (int): Number of results to return.
+        lambda_mult (float): Trade-off between relevance (1.0) and diversity (0.0).
+
+    Returns:
+        list[int]: Indices of the selected vectors, most relevant first.
+    """
+    candidates = indices[indices != -1]
+    relevance = scores[:len(candidates)]
+    vectors = vector_db.reconstruct_batch(candidates)
+    similarity = vectors @ vectors.T
+
+    selected: list[int] = []
+    remaining = list(range(len(candidates)))
+    while remaining and len(selected) < k:
+        if selected:
+            redundancy = similarity[np.ix_(remaining, selected)].max(axis=1)
+        else:
+            redundancy = np.zeros(len(remaining))
+        mmr = lambda_mult * relevance[remaining] - (1 - lambda_mult) * redundancy
+        selected.append(remaining.pop(int(mmr.argmax())))
+    return [int(candidates[i]) for i in selected]
@@ -0,0 +1,101 @@
+import time
+
+from langchain_core.documents import Document
+
+from rag.utills.deduplicate import deduplicate_chunks
+
+HEADER = "| Region | Quarter | Revenue | Cost | Margin |\n| --- | --- | --- | --- | --- |\n"
+REPORT = (
+    "The supplier agreement covers delivery of spare parts to all regional "
+    "warehouses. Orders are placed monthly and invoiced at the end of each "
+    "quarter. Late deliveries are escalated to the account manager and "
+    "reviewed at the quarterly business meeting. The contract penalty is "
+    "{amount} EUR per late shipment, applied to the next invoice. Disputes "
+    "are resolved by the procurement committee within thirty days of the "
+    "claim, and the decision is final for both parties involved."
+)
+
+
+def test_identical_chunks_are_merged_and_kept_retrievable():
+    chunks = [
+        Document(page_content=HEADER * 3, metadata={"Header 1": "Sheet A"}),
+        Document(page_content="Unrelated notes about the onboarding process."),
+        Document(page_content=HEADER * 3, metadata={"Header 1": "Sheet B"}),
+    ]
+
+    result = deduplicate_chunks(chunks)
+
+    assert [doc.metadata.get("Header 1") for doc in result] == ["Sheet A", None]
+    [duplicate] = result[0].metadata["duplicates"]
+    assert "page_content" not in duplicate
+    assert duplicate["metadata"] == {"Header 1": "Sheet B"}
+    assert len(duplicate["content_hash"]) == 64
+    assert "duplicates" not in result[1].metadata
+
+
+def test_input_documents_are_not_modified():
+    chunks = [
+        Document(page_content=HEADER * 3, metadata={"Header 1": "Sheet A"}),
+        Document(page_content=HEADER * 3, metadata={"Header 1": "Sheet B"}),
+    ]
+
+    result = deduplicate_chunks(chunks)
+
+    assert "duplicates" in result[0].metadata
+    assert chunks[0].metadata == {"Header 1": "Sheet A"}
+
+
+def test_whitespace_only_differences_are_merged():
+    chunks = [
+        Document(page_content=REPORT.format(amount=1234)),
+        Document(page_content=REPORT.format(amount=1234).replace(" ", "  ")),
+    ]
+
+    assert len(deduplicate_chunks(chunks)) == 1
+
+
+def test_chunks_differing_in_one_word_are_merged():
+    chunks = [
+        Document(page_content=REPORT.format(amount=1234)),
+        Document(page_content=REPORT.format(amount=1234).replace("monthly", "weekly")),
+    ]
+
+    assert len(deduplicate_chunks(chunks)) == 1
+
+
+def test_chunks_differing_in_a_number_are_not_merged():
+    for seed in range(20):
+        chunks = [
+            Document(page_content=REPORT.format(amount=1234)),
+            Document(page_content=REPORT.format(amount=9876)),
+        ]
+
+        result = deduplicate_chunks(chunks, threshold=0.5, seed=seed)
+
+        assert [doc.page_content for doc in result] == [chunk.page_content for chunk in chunks]
+
+
+def test_duplicates_after_a_similar_distinct_chunk_are_merged():
+    chunks = [
+        Document(page_content=REPORT.format(amount=1234)),
+        Document(page_content=REPORT.format(amount=9876)),
+        Document(page_content=REPORT.format(amount=9876)),
+    ]
+
+    result = deduplicate_chunks(chunks)
+
+    assert len(result) == 2
+    assert "duplicates" not in result[0].metadata
+    assert len(result[1].metadata["duplicates"]) == 1
+
+
+def test_many_identical_chunks_are_deduplicated_quickly():
+    chunks = [Document(page_content=HEADER * 3) for _ in range(5000)]
+
+    start = time.perf_counter()
+    result = deduplicate_chunks(chunks)
+    elapsed = time.perf_counter() - start
+
+    assert len(result) == 1
+    assert len(result[0].metadata["duplicates"]) == 4999
+    assert elapsed < 5
@@ -0,0 +1,117 @@
+import threading
+import time
+from zlib import crc32
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from rag import graph_logic
+from rag.graph_logic import RAGGraph
+from rag.utills import create_vectorDB
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def make_embeddings(self, data, batch_size=128):
+        self.calls.append(len(data))
+        vectors = np.stack([
+            np.random.default_rng(crc32(doc.page_content.encode())).standard_normal(8)
+            for doc in data
+        ]).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class CountingIndex:
+    def __init__(self, index):
+        self.index = index
+        self.search_shapes = []
+
+    def search(self, x, k):
+        self.search_shapes.append(x.shape)
+        return self.index.search(x=x, k=k)
+
+    def __getattr__(self, name):
+        return getattr(self.index, name)
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def invoke(self, messages):
+        with self.lock:
+            self.calls += 1
+        question = messages[-1].content
+        if question.startswith("slow"):
+            time.sleep(0.3)
+        if question.startswith("sleepy"):
+            time.sleep(0.1)
+        if question.startswith("fail"):
+            raise RuntimeError("model unavailable")
+        return AIMessage(content=f"answer to {question}")
+
+
+@pytest.fixture
+def model(monkeypatch):
+    fake_model = FakeModel()
+    monkeypatch.setattr(graph_logic, "get_model", lambda: fake_model)
+    monkeypatch.setenv("VDB_SEARCH_K", "2")
+    monkeypatch.delenv("VDB_MMR_LAMBDA", raising=False)
+    return fake_model
+
+
+@pytest.fixture
+def rag_graph(model):
+    chunks = [Document(page_content=f"chunk {i}") for i in range(10)]
+    embedder = FakeEmbedder()
+    vector_db = CountingIndex(create_vectorDB(embedder.make_embeddings(chunks)))
+    embedder.calls.clear()
+    return RAGGraph(chunks, embedder, vector_db)
+
+
+@pytest.mark.parametrize("mmr_lambda", [None, "0.5"])
+def test_batch_retrieval_uses_one_embedding_call_and_one_search(monkeypatch, rag_graph, mmr_lambda):
+    if mmr_lambda:
+        monkeypatch.setenv("VDB_MMR_LAMBDA", mmr_lambda)
+    questions = [f"question {i}" for i in range(5)]
+
+    found_docs = rag_graph.retrieve_batch(questions)
+
+    assert rag_graph.embedder.calls == [5]
+    assert [shape[0] for shape in rag_graph.vector_db.search_shapes] == [5]
+    assert all(len(docs) == 2 for docs in found_docs)
+
+
+def test_answers_are_yielded_as_they_finish(rag_graph):
+    questions = ["slow question", "fast question 1", "fast question 2"]
+
+    results = list(rag_graph.get_batch_queries(questions, max_concurrency=3))
+
+    assert results[-1] == (0, {"text": "answer to slow question"})
+    assert sorted(idx for idx, _ in results) == [0, 1, 2]
+
+
+def test_failed_question_yields_error_and_others_complete(rag_graph):
+    questions = ["question 1", "fail question", "question 3"]
+
+    results = dict(rag_graph.get_batch_queries(questions, max_concurrency=2))
+
+    assert results[1] == {"error": "model unavailable"}
+    assert results[0] == {"text": "answer to question 1"}
+    assert results[2] == {"text": "answer to question 3"}
+
+
+def test_closing_the_iterator_stops_queued_questions(rag_graph, model):
+    questions = [f"sleepy question {i}" for i in range(10)]
+
+    answers = rag_graph.get_batch_queries(questions, max_concurrency=2)
+    next(answers)
+    answers.close()
+    time.sleep(0.5)
+
+    assert model.calls <= 3
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from rag.registry import DocumentRegistry
+
+N_UPLOADS = 8
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "handbook.txt"
+    path.write_text("Company handbook")
+    return str(path)
+
+
+def wait_for_refcount(registry, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        entries = list(registry._entries.values())
+        if entries and entries[0].refcount >= count:
+            return
+        time.sleep(0.01)
+    raise TimeoutError("uploads did not reach the registry")
+
+
+def acquire_concurrently(registry, path):
+    results, errors = [], []
+
+    def upload():
+        try:
+            results.append(registry.acquire(path))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=upload) for _ in range(N_UPLOADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_uploads_share_one_ingest(monkeypatch, document):
+    registry = DocumentRegistry()
+    calls = []
+
+    def fake_prepare_rag_assets(file_path, **kwargs):
+        calls.append(file_path)
+        wait_for_refcount(registry, N_UPLOADS)
+        return ["chunk"], "embedder", "vector_db"
+
+    monkeypatch.setattr("rag.engine.prepare_rag_assets", fake_prepare_rag_assets)
+
+    results, errors = acquire_concurrently(registry, document)
+
+    assert errors == []
+    assert len(calls) == 1
+    assert len({key for key, _ in results}) == 1
+    assert all(assets is results[0][1] for _, assets in results)
+    key = results[0][0]
+    assert registry._entries[key].refcount == N_UPLOADS
+
+    for _ in range(N_UPLOADS - 1):
+        registry.release(key)
+    assert key in registry._entries
+    registry.release(key)
+    assert key not in registry._entries
+
+
+def test_failed_ingest_fails_all_waiters_and_is_retried(monkeypatch, document):
+    registry = DocumentRegistry()
+    calls = []
+
+    def failing_prepare_rag_assets(file_path, **kwargs):
+        calls.append(file_path)
+        wait_for_refcount(registry, N_UPLOADS)
+        raise RuntimeError("ingest failed")
+
+    monkeypatch.setattr("rag.engine.prepare_rag_assets", failing_prepare_rag_assets)
+
+    results, errors = acquire_concurrently(registry, document)
+
+    assert results == []
+    assert len(errors) == N_UPLOADS
+    assert all(str(e) == "ingest failed" for e in errors)
+    assert len(calls) == 1
+    assert registry._entries == {}
+
+    monkeypatch.setattr("rag.engine.prepare_rag_assets",
+                        lambda file_path, **kwargs: (["chunk"], "embedder", "vector_db"))
+
+    key, assets = registry.acquire(document)
+
+    assert assets == (("chunk",), "embedder", "vector_db")
+    assert registry._entries[key].refcount == 1
+
+
+def test_ingest_settings_are_part_of_the_key(document):
+    assert DocumentRegistry(chunk_size=512).document_key(document) != \
+        DocumentRegistry(chunk_size=256).document_key(document)